@@ -152,6 +152,7 @@ class CFormatter:
         """Initialise."""
         self.scalar_type = np.dtype(dtype)
         self.real_type = dtype_to_scalar_dtype(dtype)
+        self._format_cache: dict = {}
 
     def _dtype_to_name(self, dtype) -> str:
         """Convert dtype to C name."""
@@ -167,22 +168,38 @@ class CFormatter:
 
     def _format_number(self, x):
         """Format a number."""
-        # Use 16sf for precision (good for float64 or less)
-        if isinstance(x, complex):
-            return f"({x.real:.16}+I*{x.imag:.16})"
-        elif isinstance(x, float):
-            return f"{x:.16}"
-        return str(x)
+        # Tables repeat the same values many times, so cache the
+        # formatted strings. Keyed on type as well, since e.g. 0 and
+        # 0.0 compare and hash equal but format differently.
+        key = (type(x), x)
+        s = self._format_cache.get(key)
+        if s is None:
+            # Use 16sf for precision (good for float64 or less)
+            if isinstance(x, complex):
+                s = f"({x.real:.16}+I*{x.imag:.16})"
+            elif isinstance(x, float):
+                s = f"{x:.16}"
+            else:
+                s = str(x)
+            self._format_cache[key] = s
+        return s
 
     def _build_initializer_lists(self, values):
         """Build initializer lists."""
-        arr = "{"
-        if len(values.shape) == 1:
-            arr += ", ".join(self._format_number(v) for v in values)
-        elif len(values.shape) > 1:
-            arr += ",\n  ".join(self._build_initializer_lists(v) for v in values)
-        arr += "}"
-        return arr
+        # Format the flattened values once; iterating over the ndarray
+        # itself yields a numpy scalar per element, which is much slower
+        flat = [self._format_number(v) for v in values.ravel().tolist()]
+
+        def nest(shape, offset):
+            if len(shape) == 1:
+                return "{" + ", ".join(flat[offset : offset + shape[0]]) + "}"
+            stride = int(np.prod(shape[1:]))
+            inner = (nest(shape[1:], offset + i * stride) for i in range(shape[0]))
+            return "{" + ",\n  ".join(inner) + "}"
+
+        if values.ndim == 0:
+            return "{}"
+        return nest(values.shape, 0)
 
     def format_statement_list(self, slist) -> str:
         """Format a statement list."""
@@ -69,6 +69,9 @@ class FFCXBackendAccess:
             for k in self.call_lookup.keys():
                 if isinstance(e, k):
                     handler = self.call_lookup[k]
+                    # Cache resolved handler so subsequent terminals of
+                    # this type dispatch with a single dict lookup
+                    self.call_lookup[type(e)] = handler
                     break
 
         if handler:
@@ -18,35 +18,6 @@ from ffcx.ir.representationutils import QuadratureRule
 logger = logging.getLogger("ffcx")
 
 
-def create_quadrature_index(quadrature_rule, quadrature_index_symbol):
-    """Create a multi index for the quadrature loop."""
-    ranges = [0]
-    name = quadrature_index_symbol.name
-    indices = [L.Symbol(name, dtype=L.DataType.INT)]
-    if quadrature_rule:
-        ranges = [quadrature_rule.weights.size]
-        if quadrature_rule.has_tensor_factors:
-            dim = len(quadrature_rule.tensor_factors)
-            ranges = [factor[1].size for factor in quadrature_rule.tensor_factors]
-            indices = [L.Symbol(name + f"{i}", dtype=L.DataType.INT) for i in range(dim)]
-
-    return L.MultiIndex(indices, ranges)
-
-
-def create_dof_index(tabledata, dof_index_symbol):
-    """Create a multi index for the coefficient dofs."""
-    name = dof_index_symbol.name
-    if tabledata.has_tensor_factorisation:
-        dim = len(tabledata.tensor_factors)
-        ranges = [factor.values.shape[-1] for factor in tabledata.tensor_factors]
-        indices = [L.Symbol(f"{name}{i}", dtype=L.DataType.INT) for i in range(dim)]
-    else:
-        ranges = [tabledata.values.shape[-1]]
-        indices = [L.Symbol(name, dtype=L.DataType.INT)]
-
-    return L.MultiIndex(indices, ranges)
-
-
 class FFCXBackendDefinitions:
     """FFCx specific code definitions."""
 
@@ -61,6 +32,13 @@ class FFCXBackendDefinitions:
 
         self.ir = ir
 
+        # Multi indices are immutable once built, so they can be shared
+        # within a compilation. Keyed on object identity: QuadratureRule
+        # equality ignores tensor factors, so equal-looking rules can
+        # still need different indices
+        self._quadrature_index_cache: dict = {}
+        self._dof_index_cache: dict = {}
+
         # called, depending on the first argument type.
         self.handler_lookup = {
             ufl.coefficient.Coefficient: self.coefficient,
@@ -92,19 +70,58 @@ class FFCXBackendDefinitions:
         terminal = mt.terminal
         ttype = type(terminal)
 
-        # Look for parent class of ttype or direct handler
-        while ttype not in self.handler_lookup and ttype.__bases__:
-            ttype = ttype.__bases__[0]
-
-        # Get the handler from the lookup, or None if not found
+        # Get the handler from the lookup, resolving parent classes on
+        # first use and caching the result for the concrete type
         handler = self.handler_lookup.get(ttype)
-
         if handler is None:
-            raise NotImplementedError(f"No handler for terminal type: {ttype}")
+            base = ttype
+            while base not in self.handler_lookup and base.__bases__:
+                base = base.__bases__[0]
+            handler = self.handler_lookup.get(base)
+            if handler is None:
+                raise NotImplementedError(f"No handler for terminal type: {ttype}")
+            self.handler_lookup[ttype] = handler
 
         # Call the handler
         return handler(mt, tabledata, quadrature_rule, access)
 
+    def create_quadrature_index(self, quadrature_rule, quadrature_index_symbol):
+        """Create a multi index for the quadrature loop."""
+        name = quadrature_index_symbol.name
+        key = (id(quadrature_rule), name)
+        index = self._quadrature_index_cache.get(key)
+        if index is None:
+            ranges = [0]
+            indices = [L.Symbol(name, dtype=L.DataType.INT)]
+            if quadrature_rule:
+                ranges = [quadrature_rule.weights.size]
+                if quadrature_rule.has_tensor_factors:
+                    dim = len(quadrature_rule.tensor_factors)
+                    ranges = [factor[1].size for factor in quadrature_rule.tensor_factors]
+                    indices = [L.Symbol(name + f"{i}", dtype=L.DataType.INT) for i in range(dim)]
+
+            index = L.MultiIndex(indices, ranges)
+            self._quadrature_index_cache[key] = index
+        return index
+
+    def create_dof_index(self, tabledata, dof_index_symbol):
+        """Create a multi index for the coefficient dofs."""
+        name = dof_index_symbol.name
+        key = (id(tabledata), name)
+        index = self._dof_index_cache.get(key)
+        if index is None:
+            if tabledata.has_tensor_factorisation:
+                dim = len(tabledata.tensor_factors)
+                ranges = [factor.values.shape[-1] for factor in tabledata.tensor_factors]
+                indices = [L.Symbol(f"{name}{i}", dtype=L.DataType.INT) for i in range(dim)]
+            else:
+                ranges = [tabledata.values.shape[-1]]
+                indices = [L.Symbol(name, dtype=L.DataType.INT)]
+
+            index = L.MultiIndex(indices, ranges)
+            self._dof_index_cache[key] = index
+        return index
+
     def coefficient(
         self,
         mt: ModifiedTerminal,
@@ -120,8 +137,8 @@ class FFCXBackendDefinitions:
         iq_symbol = self.symbols.quadrature_loop_index
         ic_symbol = self.symbols.coefficient_dof_sum_index
 
-        iq = create_quadrature_index(quadrature_rule, iq_symbol)
-        ic = create_dof_index(tabledata, ic_symbol)
+        iq = self.create_quadrature_index(quadrature_rule, iq_symbol)
+        ic = self.create_dof_index(tabledata, ic_symbol)
 
         # Get properties of tables
         ttype = tabledata.ttype
@@ -188,8 +205,8 @@ class FFCXBackendDefinitions:
         # Get access to element table
         ic_symbol = self.symbols.coefficient_dof_sum_index
         iq_symbol = self.symbols.quadrature_loop_index
-        ic = create_dof_index(tabledata, ic_symbol)
-        iq = create_quadrature_index(quadrature_rule, iq_symbol)
+        ic = self.create_dof_index(tabledata, ic_symbol)
+        iq = self.create_quadrature_index(quadrature_rule, iq_symbol)
         FE, tables = self.access.table_access(tabledata, self.entitytype, mt.restriction, iq, ic)
 
         dof_access = L.Symbol("coordinate_dofs", dtype=L.DataType.REAL)
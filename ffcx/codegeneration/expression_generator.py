@@ -172,11 +172,11 @@ class ExpressionGenerator:
         preparts = []
         quadparts = []
 
-        blocks = [
+        blocks = (
             (blockmap, blockdata)
             for blockmap, contributions in sorted(block_contributions.items())
             for blockdata in contributions
-        ]
+        )
 
         for blockmap, blockdata in blocks:
             # Define code for block depending on mode
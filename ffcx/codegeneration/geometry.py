@@ -5,14 +5,21 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 """Geometry."""
 
+import functools
+
 import basix
 import numpy as np
 
 import ffcx.codegeneration.lnodes as L
 
 
+@functools.cache
 def write_table(tablename, cellname):
-    """Write a table."""
+    """Write a table.
+
+    The declarations only depend on the table and cell names, so they
+    are cached across integrals and forms.
+    """
     if tablename == "facet_edge_vertices":
         return facet_edge_vertices(tablename, cellname)
     if tablename == "reference_facet_jacobian":
@@ -12,11 +12,11 @@ import logging
 from numbers import Integral
 from typing import Any
 
+import numpy as np
 import ufl
 
 import ffcx.codegeneration.lnodes as L
 from ffcx.codegeneration import geometry
-from ffcx.codegeneration.definitions import create_dof_index, create_quadrature_index
 from ffcx.codegeneration.optimizer import optimize
 from ffcx.ir.elementtables import piecewise_ttypes
 from ffcx.ir.integral import BlockDataT
@@ -55,6 +55,12 @@ class IntegralGenerator:
         # - access: for accessing backend specific variables
         self.backend = backend
 
+        # Bind the backend components once; they are resolved in every
+        # generation method
+        self.symbols = backend.symbols
+        self.access = backend.access
+        self.definitions = backend.definitions
+
         # Set of operator names code has been generated for, used in the
         # end for selecting necessary includes
         self._ufl_names = set()
@@ -75,19 +81,6 @@ class IntegralGenerator:
         self.scopes = {quadrature_rule: {} for quadrature_rule in self.ir.integrand.keys()}
         self.scopes[None] = {}
 
-    def set_var(self, quadrature_rule, v, vaccess):
-        """Set a new variable in variable scope dicts.
-
-        Scope is determined by quadrature_rule which identifies the
-        quadrature loop scope or None if outside quadrature loops.
-
-        Args:
-            quadrature_rule: Quadrature rule
-            v: the ufl expression
-            vaccess: the LNodes expression to access the value in the code
-        """
-        self.scopes[quadrature_rule][v] = vaccess
-
     def get_var(self, quadrature_rule, v):
         """Lookup ufl expression v in variable scope dicts.
 
@@ -137,17 +130,15 @@ class IntegralGenerator:
         # once
         assert not any(d for d in self.scopes.values())
 
-        parts = []
-
-        # Generate the tables of quadrature points and weights
-        parts += self.generate_quadrature_tables()
-
-        # Generate the tables of basis function values and
-        # pre-integrated blocks
-        parts += self.generate_element_tables()
-
-        # Generate the tables of geometry data that are needed
-        parts += self.generate_geometry_tables()
+        # Generate the tables of quadrature points and weights, of
+        # basis function values and pre-integrated blocks, and of
+        # geometry data; these must come first since loop generation
+        # refers to the declared table symbols
+        tables = [
+            *self.generate_quadrature_tables(),
+            *self.generate_element_tables(),
+            *self.generate_geometry_tables(),
+        ]
 
         # Loop generation code will produce parts to go before
         # quadloops, to define the quadloops, and to go after the
@@ -166,9 +157,11 @@ class IntegralGenerator:
             all_quadparts += self.generate_quadrature_loop(rule)
 
         # Collect parts before, during, and after quadrature loops
-        parts += all_preparts
-        parts += all_quadparts
+        parts = [*tables, *all_preparts, *all_quadparts]
 
+        # No need for a statement list wrapper around a single part
+        if len(parts) == 1:
+            return parts[0]
         return L.StatementList(parts)
 
     def generate_quadrature_tables(self):
@@ -183,8 +176,15 @@ class IntegralGenerator:
 
         # Loop over quadrature rules
         for quadrature_rule, integrand in self.ir.integrand.items():
+            # No weights table needed for single-point rules, where the
+            # weight is inlined as a constant, or if every block is
+            # hoisted out of the quadrature loop with the weights
+            # folded into constants
+            if quadrature_rule.weights.size == 1 or self.all_blocks_piecewise(quadrature_rule):
+                continue
+
             # Generate quadrature weights array
-            wsym = self.backend.symbols.weights_table(quadrature_rule)
+            wsym = self.symbols.weights_table(quadrature_rule)
             parts += [L.ArrayDecl(wsym, values=quadrature_rule.weights, const=True)]
 
         # Add leading comment if there are any tables
@@ -257,9 +257,15 @@ class IntegralGenerator:
         If the dof dimensions of the table have dof rotations, apply
         these rotations.
 
+        The innermost (dof) dimension is zero-padded to a multiple of
+        four so the emitted array gets vectorization-friendly strides;
+        all accesses keep using the unpadded extents.
         """
         table_symbol = L.Symbol(name, dtype=L.DataType.REAL)
-        self.backend.symbols.element_tables[name] = table_symbol
+        self.symbols.element_tables[name] = table_symbol
+        pad = -table.shape[-1] % 4
+        if pad:
+            table = np.pad(table, [(0, 0)] * (table.ndim - 1) + [(0, pad)])
         return [L.ArrayDecl(table_symbol, values=table, const=True)]
 
     def generate_quadrature_loop(self, quadrature_rule: QuadratureRule):
@@ -268,7 +274,9 @@ class IntegralGenerator:
         definitions, intermediates_0 = self.generate_varying_partition(quadrature_rule)
 
         # Generate dofblock parts, some of this will be placed before or after quadloop
-        tensor_comp, intermediates_fw = self.generate_dofblock_partition(quadrature_rule)
+        preparts, pre_intermediates, tensor_comp, intermediates_fw = (
+            self.generate_dofblock_partition(quadrature_rule)
+        )
         assert all([isinstance(tc, L.Section) for tc in tensor_comp])
 
         # Check if we only have Section objects
@@ -287,13 +295,14 @@ class IntegralGenerator:
             intermediates_0 += [L.Assign(fw.symbol, fw.value)]
         intermediates = [L.Section("Intermediates", intermediates_0, declarations, inputs, output)]
 
-        iq_symbol = self.backend.symbols.quadrature_loop_index
-        iq = create_quadrature_index(quadrature_rule, iq_symbol)
+        iq_symbol = self.symbols.quadrature_loop_index
+        iq = self.definitions.create_quadrature_index(quadrature_rule, iq_symbol)
 
         code = definitions + intermediates + tensor_comp
         code = optimize(code, quadrature_rule)
 
-        return [L.create_nested_for_loops([iq], code)]
+        # Fully piecewise blocks are accumulated once, before the loop
+        return pre_intermediates + preparts + [L.create_nested_for_loops([iq], code)]
 
     def generate_piecewise_partition(self, quadrature_rule):
         """Generate a piecewise partition."""
@@ -312,100 +321,162 @@ class IntegralGenerator:
     def generate_partition(self, symbol, F, mode, quadrature_rule):
         """Generate a partition."""
         definitions = []
+        seen_definitions = set()
         intermediates = []
+        intermediate_cache: dict[str, L.Symbol] = {}
+
+        # Bind hot lookups to locals; this loop runs once per vertex of
+        # the factorization graph
+        get_var = self.get_var
+        ufl_to_lnodes = L.ufl_to_lnodes
+        access_get = self.access.get
+        definitions_get = self.definitions.get
+        scope = self.scopes[quadrature_rule]
+        piecewise_scope = self.scopes[None]
 
         for i, attr in F.nodes.items():
             if attr["status"] != mode:
                 continue
             v = attr["expression"]
 
+            # Literals are converted on the fly by get_var and need no
+            # stored access
+            if v._ufl_is_literal_:
+                continue
+
             # Generate code only if the expression is not already in cache
-            if not self.get_var(quadrature_rule, v):
-                if v._ufl_is_literal_:
-                    vaccess = L.ufl_to_lnodes(v)
-                elif mt := attr.get("mt"):
+            if scope.get(v) is None and piecewise_scope.get(v) is None:
+                if mt := attr.get("mt"):
                     tabledata = attr.get("tr")
 
                     # Backend specific modified terminal translation
-                    vaccess = self.backend.access.get(mt, tabledata, quadrature_rule)
-                    vdef = self.backend.definitions.get(mt, tabledata, quadrature_rule, vaccess)
+                    vaccess = access_get(mt, tabledata, quadrature_rule)
+                    vdef = definitions_get(mt, tabledata, quadrature_rule, vaccess)
 
                     if vdef:
                         assert isinstance(vdef, L.Section)
-                    # Only add if definition is unique.
-                    # This can happen when using sub-meshes
-                    if vdef not in definitions:
+                        # Only add if definition is unique.
+                        # This can happen when using sub-meshes
+                        if vdef not in seen_definitions:
+                            seen_definitions.add(vdef)
+                            definitions += [vdef]
+                    elif vdef not in definitions:
                         definitions += [vdef]
                 else:
                     # Get previously visited operands
-                    vops = [self.get_var(quadrature_rule, op) for op in v.ufl_operands]
+                    vops = [get_var(quadrature_rule, op) for op in v.ufl_operands]
                     dtype = extract_dtype(v, vops)
 
                     # Mapping UFL operator to target language
                     self._ufl_names.add(v._ufl_handler_name_)
-                    vexpr = L.ufl_to_lnodes(v, *vops)
-
-                    j = len(intermediates)
-                    vaccess = L.Symbol(f"{symbol.name}_{j}", dtype=dtype)
-                    intermediates.append(L.VariableDecl(vaccess, vexpr))
+                    vexpr = ufl_to_lnodes(v, *vops)
+
+                    if mode == "varying" and not attr.get("target") and len(F.in_edges[i]) == 1:
+                        # Single-use expression: inline it into its only
+                        # consumer so it stays in a register instead of
+                        # round-tripping through an intermediate
+                        vaccess = vexpr
+                    else:
+                        # Reuse an earlier intermediate computing the same
+                        # expression instead of relying on compiler CSE
+                        key = repr(vexpr)
+                        cached = intermediate_cache.get(key)
+                        if cached is not None:
+                            vaccess = cached
+                        else:
+                            j = len(intermediates)
+                            vaccess = L.Symbol(f"{symbol.name}_{j}", dtype=dtype)
+                            intermediates.append(L.VariableDecl(vaccess, vexpr))
+                            intermediate_cache[key] = vaccess
 
                 # Store access node for future reference
-                self.set_var(quadrature_rule, v, vaccess)
+                scope[v] = vaccess
 
         # Optimize definitions
         definitions = optimize(definitions, quadrature_rule)
         return definitions, intermediates
 
+    def block_is_piecewise(self, blockdata: BlockDataT) -> bool:
+        """Check if a block is constant over the quadrature points."""
+        return (
+            blockdata.all_factors_piecewise
+            and all(tt in piecewise_ttypes for tt in blockdata.ttypes)
+            and not any(mad.tabledata.has_tensor_factorisation for mad in blockdata.ma_data)
+        )
+
+    def all_blocks_piecewise(self, quadrature_rule: QuadratureRule) -> bool:
+        """Check if every block for this rule is constant over the quadrature points."""
+        if self.ir.integral_type in ufl.custom_integral_types:
+            return False
+        block_contributions = self.ir.integrand[quadrature_rule]["block_contributions"]
+        return all(
+            self.block_is_piecewise(blockdata)
+            for contributions in block_contributions.values()
+            for blockdata in contributions
+        )
+
     def generate_dofblock_partition(self, quadrature_rule: QuadratureRule):
         """Generate a dofblock partition."""
         block_contributions = self.ir.integrand[quadrature_rule]["block_contributions"]
+        preparts = []
+        pre_intermediates = []
         quadparts = []
-        blocks = [
-            (blockmap, blockdata)
-            for blockmap, contributions in sorted(block_contributions.items())
-            for blockdata in contributions
-        ]
-
         block_groups = collections.defaultdict(list)
 
         # Group loops by blockmap, in Vector elements each component has
         # a different blockmap
-        for blockmap, blockdata in blocks:
-            scalar_blockmap = []
-            assert len(blockdata.ma_data) == len(blockmap)
-            for i, b in enumerate(blockmap):
-                bs = blockdata.ma_data[i].tabledata.block_size
-                offset = blockdata.ma_data[i].tabledata.offset
-                b = tuple([(idx - offset) // bs for idx in b])
-                scalar_blockmap.append(b)
-            block_groups[tuple(scalar_blockmap)].append(blockdata)
+        for blockmap, contributions in sorted(block_contributions.items()):
+            for blockdata in contributions:
+                scalar_blockmap = []
+                assert len(blockdata.ma_data) == len(blockmap)
+                for i, b in enumerate(blockmap):
+                    bs = blockdata.ma_data[i].tabledata.block_size
+                    offset = blockdata.ma_data[i].tabledata.offset
+                    b = tuple([(idx - offset) // bs for idx in b])
+                    scalar_blockmap.append(b)
+                block_groups[tuple(scalar_blockmap)].append(blockdata)
+
+        # Emit groups with the same table-type structure adjacently, so
+        # blocks sharing a loop nest shape end up next to each other in
+        # the generated code
+        def group_key(item):
+            blockmap, blocklist = item
+            return (tuple(blockdata.ttypes for blockdata in blocklist), blockmap)
 
         intermediates = []
-        for blockmap in block_groups:
+        for blockmap, blocklist in sorted(block_groups.items(), key=group_key):
+            # Blocks whose factors and tables are all constant over the
+            # quadrature points can be accumulated once, scaled by the
+            # sum of quadrature weights, instead of per point
+            hoistable = self.ir.integral_type not in ufl.custom_integral_types and all(
+                self.block_is_piecewise(blockdata) for blockdata in blocklist
+            )
             block_quadparts, intermediate = self.generate_block_parts(
-                quadrature_rule, blockmap, block_groups[blockmap]
+                quadrature_rule, blockmap, blocklist, piecewise=hoistable
             )
-            intermediates += intermediate
-
-            # Add computations
-            quadparts.extend(block_quadparts)
+            if hoistable:
+                pre_intermediates += intermediate
+                preparts.extend(block_quadparts)
+            else:
+                intermediates += intermediate
+                quadparts.extend(block_quadparts)
 
-        return quadparts, intermediates
+        return preparts, pre_intermediates, quadparts, intermediates
 
     def get_arg_factors(self, blockdata, block_rank, quadrature_rule, iq, indices):
         """Get arg factors."""
         arg_factors = []
         tables = []
+        scope = self.ir.integrand[quadrature_rule]["modified_arguments"]
         for i in range(block_rank):
             mad = blockdata.ma_data[i]
             td = mad.tabledata
-            scope = self.ir.integrand[quadrature_rule]["modified_arguments"]
             mt = scope[mad.ma_index]
             arg_tables = []
 
             # Translate modified terminal to code
             # TODO: Move element table access out of backend?
-            #       Not using self.backend.access.argument() here
+            #       Not using self.access.argument() here
             #       now because it assumes too much about indices.
 
             assert td.ttype != "zeros"
@@ -414,7 +485,7 @@ class IntegralGenerator:
                 arg_factor = 1
             else:
                 # Assuming B sparsity follows element table sparsity
-                arg_factor, arg_tables = self.backend.access.table_access(
+                arg_factor, arg_tables = self.access.table_access(
                     td, self.ir.entitytype, mt.restriction, iq, indices[i]
                 )
 
@@ -424,13 +495,22 @@ class IntegralGenerator:
         return arg_factors, tables
 
     def generate_block_parts(
-        self, quadrature_rule: QuadratureRule, blockmap: tuple, blocklist: list[BlockDataT]
+        self,
+        quadrature_rule: QuadratureRule,
+        blockmap: tuple,
+        blocklist: list[BlockDataT],
+        piecewise: bool = False,
     ):
         """Generate and return code parts for a given block.
 
         Returns parts occurring before, inside, and after the quadrature
         loop identified by the quadrature rule.
 
+        If piecewise is True, the block is constant over the quadrature
+        points and the generated code accumulates it once, scaled by the
+        sum of the quadrature weights, for placement outside the
+        quadrature loop.
+
         Should be called with quadrature_rule=None for
         quadloop-independent blocks.
         """
@@ -444,15 +524,33 @@ class IntegralGenerator:
         rhs_expressions = collections.defaultdict(list)
 
         block_rank = len(blockmap)
-        iq_symbol = self.backend.symbols.quadrature_loop_index
-        iq = create_quadrature_index(quadrature_rule, iq_symbol)
+        iq_symbol = self.symbols.quadrature_loop_index
+        iq = self.definitions.create_quadrature_index(quadrature_rule, iq_symbol)
+
+        # Factorization graph and quadrature weight are the same for all
+        # blocks in this partition
+        F = self.ir.integrand[quadrature_rule]["factorization"]
+        if piecewise:
+            # Every factor is constant over the quadrature points, so
+            # sum_q w[q] * f * u * v reduces to f * u * v * sum(w)
+            weight: L.LExpr = L.LiteralFloat(float(np.sum(quadrature_rule.weights)))
+        elif self.ir.integral_type in ufl.custom_integral_types:
+            weights = self.symbols.custom_weights_table
+            weight = weights[iq.global_index]
+        elif quadrature_rule.weights.size == 1:
+            # Single-point rule: inline the weight instead of reading a
+            # one-element table
+            weight = L.LiteralFloat(float(quadrature_rule.weights[0]))
+        else:
+            weights = self.symbols.weights_table(quadrature_rule)
+            weight = weights[iq.global_index]
 
         for blockdata in blocklist:
             B_indices = []
             for i in range(block_rank):
                 table_ref = blockdata.ma_data[i].tabledata
-                symbol = self.backend.symbols.argument_loop_index(i)
-                index = create_dof_index(table_ref, symbol)
+                symbol = self.symbols.argument_loop_index(i)
+                index = self.definitions.create_dof_index(table_ref, symbol)
                 B_indices.append(index)
 
             ttypes = blockdata.ttypes
@@ -468,26 +566,17 @@ class IntegralGenerator:
             factor_index = blockdata.factor_indices_comp_indices[0][0]
 
             # Get factor expression
-            F = self.ir.integrand[quadrature_rule]["factorization"]
-
             v = F.nodes[factor_index]["expression"]
             f = self.get_var(quadrature_rule, v)
 
-            # Quadrature weight was removed in representation, add it back now
-            if self.ir.integral_type in ufl.custom_integral_types:
-                weights = self.backend.symbols.custom_weights_table
-                weight = weights[iq.global_index]
-            else:
-                weights = self.backend.symbols.weights_table(quadrature_rule)
-                weight = weights[iq.global_index]
-
-            # Define fw = f * weight
-            fw_rhs = L.float_product([f, weight])
-            if not isinstance(fw_rhs, L.Product):
+            # Quadrature weight was removed in representation, add it
+            # back now by defining fw = f * weight
+            fw_rhs = L.mul_chain([f, weight])
+            if not isinstance(fw_rhs, (L.Mul, L.ArrayAccess)):
                 fw = fw_rhs
             else:
                 # Define and cache scalar temp variable
-                key = (quadrature_rule, factor_index, blockdata.all_factors_piecewise)
+                key = (quadrature_rule, factor_index, blockdata.all_factors_piecewise, piecewise)
                 fw, defined = self.get_temp_symbol("fw", key)
                 if not defined:
                     input = [f, weight]
@@ -534,12 +623,17 @@ class IntegralGenerator:
 
         body: list[L.LNode] = []
 
-        A = self.backend.symbols.element_tensor
+        A = self.symbols.element_tensor
         A_shape = self.ir.tensor_shape
         for indices in keep:
             multi_index = L.MultiIndex(list(indices), A_shape)
-            for expression in keep[indices]:
-                body.append(L.AssignAdd(A[multi_index], expression))
+            expressions = keep[indices]
+            if len(expressions) == 1:
+                body.append(L.AssignAdd(A[multi_index], expressions[0]))
+            else:
+                # Fuse all contributions to this entry into a single
+                # accumulation statement
+                body.append(L.AssignAdd(A[multi_index], L.Sum(expressions)))
 
         # reverse B_indices
         B_indices = B_indices[::-1]
@@ -23,6 +23,7 @@ Not supported:
  Strings
 """
 
+import math
 import numbers
 from collections.abc import Sequence
 from enum import Enum
@@ -100,6 +101,25 @@ def float_product(factors):
         return Product(factors)
 
 
+def mul_chain(factors):
+    """Build a left-folded chain of binary products of float factors.
+
+    Simplify ones and zeros and return 1.0 for an empty sequence.
+    Cheaper to construct than an n-ary Product when the result is not
+    inspected further.
+    """
+    factors = [f for f in factors if not is_one_lexpr(f)]
+    if len(factors) == 0:
+        return LiteralFloat(1.0)
+    for f in factors:
+        if is_zero_lexpr(f):
+            return f
+    expr = factors[0]
+    for f in factors[1:]:
+        expr = Mul(expr, f)
+    return expr
+
+
 class DataType(Enum):
     """Representation of data types for variables in LNodes.
 
@@ -133,6 +153,8 @@ def merge_dtypes(dtypes: list[DataType]):
 class LNode:
     """Base class for all AST nodes."""
 
+    __slots__ = ()
+
     def __eq__(self, other):
         """Check for equality."""
         return NotImplemented
@@ -145,10 +167,11 @@ class LNode:
 class LExpr(LNode):
     """Base class for all expressions.
 
-    All subtypes should define a 'precedence' class attribute.
+    All subtypes should define a 'precedence' class attribute and
+    assign the 'dtype' slot (DataType.NONE if unknown).
     """
 
-    dtype = DataType.NONE
+    __slots__ = ("dtype",)
 
     def __getitem__(self, indices):
         """Get an item."""
@@ -272,18 +295,21 @@ class LExpr(LNode):
 class LExprOperator(LExpr):
     """Base class for all expression operators."""
 
+    __slots__ = ()
     sideeffect = False
 
 
 class LExprTerminal(LExpr):
     """Base class for all  expression terminals."""
 
+    __slots__ = ()
     sideeffect = False
 
 
 class LiteralFloat(LExprTerminal):
     """A floating point literal value."""
 
+    __slots__ = ("value",)
     precedence = PRECEDENCE.LITERAL
 
     def __init__(self, value):
@@ -311,6 +337,7 @@ class LiteralFloat(LExprTerminal):
 class LiteralInt(LExprTerminal):
     """An integer literal value."""
 
+    __slots__ = ("value",)
     precedence = PRECEDENCE.LITERAL
 
     def __init__(self, value):
@@ -335,6 +362,7 @@ class LiteralInt(LExprTerminal):
 class Symbol(LExprTerminal):
     """A named symbol."""
 
+    __slots__ = ("name",)
     precedence = PRECEDENCE.SYMBOL
 
     def __init__(self, name: str, dtype):
@@ -360,6 +388,7 @@ class Symbol(LExprTerminal):
 class MultiIndex(LExpr):
     """A multi-index for accessing tensors flattened in memory."""
 
+    __slots__ = ("global_index", "sizes", "symbols")
     precedence = PRECEDENCE.SYMBOL
 
     def __init__(self, symbols: list, sizes: list):
@@ -373,9 +402,15 @@ class MultiIndex(LExpr):
         dim = len(sizes)
         if dim == 0:
             self.global_index: LExpr = LiteralInt(0)
+        elif dim == 1:
+            # Unit stride; no flattening expression needed
+            self.global_index = self.symbols[0]
         else:
-            stride = [np.prod(sizes[i:]) for i in range(dim)] + [LiteralInt(1)]
-            self.global_index = Sum(n * sym for n, sym in zip(stride[1:], symbols))
+            # Strides are reverse cumulative products of the sizes
+            stride = [1] * dim
+            for i in range(dim - 2, -1, -1):
+                stride[i] = stride[i + 1] * sizes[i + 1]
+            self.global_index = Sum(n * sym for n, sym in zip(stride, symbols))
 
     @property
     def dim(self):
@@ -384,7 +419,7 @@ class MultiIndex(LExpr):
 
     def size(self):
         """Size of the multi-index."""
-        return np.prod(self.sizes)
+        return math.prod(self.sizes)
 
     def local_index(self, idx):
         """Get the local index."""
@@ -438,22 +473,32 @@ class MultiIndex(LExpr):
 class PrefixUnaryOp(LExprOperator):
     """Base class for unary operators."""
 
+    __slots__ = ("arg",)
+
     def __init__(self, arg):
         """Initialise."""
         self.arg = as_lexpr(arg)
+        self.dtype = DataType.NONE
 
     def __eq__(self, other):
         """Check equality."""
         return isinstance(other, type(self)) and self.arg == other.arg
 
+    def __repr__(self):
+        """Representation."""
+        return f"{self.op}({self.arg})"
+
 
 class BinOp(LExprOperator):
     """A binary operator."""
 
+    __slots__ = ("lhs", "rhs")
+
     def __init__(self, lhs, rhs):
         """Initialise."""
         self.lhs = as_lexpr(lhs)
         self.rhs = as_lexpr(rhs)
+        self.dtype = DataType.NONE
 
     def __eq__(self, other):
         """Check equality."""
@@ -471,6 +516,8 @@ class BinOp(LExprOperator):
 class ArithmeticBinOp(BinOp):
     """An artithmetic binary operator."""
 
+    __slots__ = ()
+
     def __init__(self, lhs, rhs):
         """Initialise."""
         self.lhs = as_lexpr(lhs)
@@ -481,6 +528,7 @@ class ArithmeticBinOp(BinOp):
 class NaryOp(LExprOperator):
     """Base class for special n-ary operators."""
 
+    __slots__ = ("args",)
     op = ""
 
     def __init__(self, args):
@@ -500,7 +548,7 @@ class NaryOp(LExprOperator):
 
     def __repr__(self) -> str:
         """Representation."""
-        return f"{self.op} ".join(f"{i} " for i in self.args)
+        return f" {self.op} ".join(map(str, self.args))
 
     def __hash__(self):
         """Hash."""
@@ -510,6 +558,7 @@ class NaryOp(LExprOperator):
 class Neg(PrefixUnaryOp):
     """Negation operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.NEG
     op = "-"
 
@@ -522,6 +571,7 @@ class Neg(PrefixUnaryOp):
 class Not(PrefixUnaryOp):
     """Not operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.NOT
     op = "!"
 
@@ -529,6 +579,7 @@ class Not(PrefixUnaryOp):
 class Add(ArithmeticBinOp):
     """Add operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.ADD
     op = "+"
 
@@ -536,6 +587,7 @@ class Add(ArithmeticBinOp):
 class Sub(ArithmeticBinOp):
     """Subtract operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.SUB
     op = "-"
 
@@ -543,6 +595,7 @@ class Sub(ArithmeticBinOp):
 class Mul(ArithmeticBinOp):
     """Multiply operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.MUL
     op = "*"
 
@@ -550,6 +603,7 @@ class Mul(ArithmeticBinOp):
 class Div(ArithmeticBinOp):
     """Division operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.DIV
     op = "/"
 
@@ -557,6 +611,7 @@ class Div(ArithmeticBinOp):
 class EQ(BinOp):
     """Equality operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.EQ
     op = "=="
 
@@ -564,6 +619,7 @@ class EQ(BinOp):
 class NE(BinOp):
     """Inequality operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.NE
     op = "!="
 
@@ -571,6 +627,7 @@ class NE(BinOp):
 class LT(BinOp):
     """Less than operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.LT
     op = "<"
 
@@ -578,6 +635,7 @@ class LT(BinOp):
 class GT(BinOp):
     """Greater than operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.GT
     op = ">"
 
@@ -585,6 +643,7 @@ class GT(BinOp):
 class LE(BinOp):
     """Less than or equal to operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.LE
     op = "<="
 
@@ -592,6 +651,7 @@ class LE(BinOp):
 class GE(BinOp):
     """Greater than or equal to operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.GE
     op = ">="
 
@@ -599,6 +659,7 @@ class GE(BinOp):
 class And(BinOp):
     """And operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.AND
     op = "&&"
 
@@ -606,6 +667,7 @@ class And(BinOp):
 class Or(BinOp):
     """Or operator."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.OR
     op = "||"
 
@@ -613,6 +675,7 @@ class Or(BinOp):
 class Sum(NaryOp):
     """Sum of any number of operands."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.ADD
     op = "+"
 
@@ -620,6 +683,7 @@ class Sum(NaryOp):
 class Product(NaryOp):
     """Product of any number of operands."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.MUL
     op = "*"
 
@@ -627,6 +691,7 @@ class Product(NaryOp):
 class MathFunction(LExprOperator):
     """A Math Function, with any arguments."""
 
+    __slots__ = ("args", "function")
     precedence = PRECEDENCE.HIGHEST
 
     def __init__(self, func, args):
@@ -644,10 +709,15 @@ class MathFunction(LExprOperator):
             and all(a == b for a, b in zip(self.args, other.args))
         )
 
+    def __repr__(self):
+        """Representation."""
+        return f"{self.function}({', '.join(str(arg) for arg in self.args)})"
+
 
 class AssignOp(BinOp):
     """Base class for assignment operators."""
 
+    __slots__ = ()
     precedence = PRECEDENCE.ASSIGN
     sideeffect = True
 
@@ -660,36 +730,42 @@ class AssignOp(BinOp):
 class Assign(AssignOp):
     """Assign operator."""
 
+    __slots__ = ()
     op = "="
 
 
 class AssignAdd(AssignOp):
     """Assign add operator."""
 
+    __slots__ = ()
     op = "+="
 
 
 class AssignSub(AssignOp):
     """Assign subtract operator."""
 
+    __slots__ = ()
     op = "-="
 
 
 class AssignMul(AssignOp):
     """Assign multiply operator."""
 
+    __slots__ = ()
     op = "*="
 
 
 class AssignDiv(AssignOp):
     """Assign division operator."""
 
+    __slots__ = ()
     op = "/="
 
 
 class ArrayAccess(LExprOperator):
     """Array access."""
 
+    __slots__ = ("array", "indices")
     precedence = PRECEDENCE.SUBSCRIPT
 
     def __init__(self, array, indices):
@@ -746,12 +822,13 @@ class ArrayAccess(LExprOperator):
 
     def __repr__(self):
         """Representation."""
-        return str(self.array) + "[" + ", ".join(str(i) for i in self.indices) + "]"
+        return f"{self.array}[{', '.join(map(str, self.indices))}]"
 
 
 class Conditional(LExprOperator):
     """Conditional."""
 
+    __slots__ = ("condition", "false", "true")
     precedence = PRECEDENCE.CONDITIONAL
 
     def __init__(self, condition, true, false):
@@ -770,6 +847,15 @@ class Conditional(LExprOperator):
             and self.false == other.false
         )
 
+    def __repr__(self):
+        """Representation."""
+        return f"({self.condition} ? {self.true} : {self.false})"
+
+
+# Shared literals for the small non-negative ints that dominate index
+# expressions; LiteralInt is never mutated so sharing is safe
+_small_int_literals = tuple(LiteralInt(i) for i in range(128))
+
 
 def as_lexpr(node):
     """Typechecks and wraps an object as a valid LExpr.
@@ -780,6 +866,8 @@ def as_lexpr(node):
     if isinstance(node, LExpr):
         return node
     elif isinstance(node, numbers.Integral):
+        if 0 <= node < 128:
+            return _small_int_literals[node]
         return LiteralInt(node)
     elif isinstance(node, numbers.Real):
         return LiteralFloat(node)
@@ -790,6 +878,8 @@ def as_lexpr(node):
 class Statement(LNode):
     """Make an expression into a statement."""
 
+    __slots__ = ("expr",)
+
     def __init__(self, expr):
         """Initialise."""
         self.expr = as_lexpr(expr)
@@ -845,6 +935,8 @@ class Annotation(Enum):
 class Declaration(Statement):
     """Base class for all declarations."""
 
+    __slots__ = ("symbol",)
+
     def __init__(self, symbol):
         """Initialise."""
         self.symbol = symbol
@@ -862,6 +954,8 @@ def is_declaration(node) -> bool:
 class Section(LNode):
     """A section of code with a name and a list of statements."""
 
+    __slots__ = ("annotations", "declarations", "input", "name", "output", "statements")
+
     def __init__(
         self,
         name: str,
@@ -891,10 +985,16 @@ class Section(LNode):
             getattr(self, name) == getattr(other, name) for name in attributes
         )
 
+    def __hash__(self):
+        """Hash."""
+        return hash(self.name)
+
 
 class StatementList(LNode):
     """A simple sequence of statements."""
 
+    __slots__ = ("statements",)
+
     def __init__(self, statements):
         """Initialise."""
         self.statements = [as_statement(st) for st in statements]
@@ -915,6 +1015,8 @@ class StatementList(LNode):
 class Comment(Statement):
     """Line comment(s) used for annotating the generated code with human readable remarks."""
 
+    __slots__ = ("comment",)
+
     def __init__(self, comment):
         """Initialise."""
         assert isinstance(comment, str)
@@ -944,6 +1046,8 @@ def commented_code_list(code, comments):
 class VariableDecl(Declaration):
     """Declare a variable, optionally define initial value."""
 
+    __slots__ = ("value",)
+
     def __init__(self, symbol, value=None):
         """Initialise."""
         assert isinstance(symbol, Symbol)
@@ -975,6 +1079,8 @@ class ArrayDecl(Declaration):
 
     """
 
+    __slots__ = ("const", "dtype", "sizes", "values")
+
     def __init__(self, symbol, sizes=None, values=None, const=False):
         """Initialise."""
         assert isinstance(symbol, Symbol)
@@ -1033,6 +1139,8 @@ def depth(code) -> int:
 class ForRange(Statement):
     """Slightly higher-level for loop assuming incrementing an index over a range."""
 
+    __slots__ = ("begin", "body", "end", "index")
+
     def __init__(self, index, begin, end, body):
         """Initialise."""
         assert isinstance(index, Symbol) or isinstance(index, MultiIndex)
@@ -173,10 +173,14 @@ def licm(section: L.Section, quadrature_rule: QuadratureRule) -> L.Section:
         for statement in statements:
             assert isinstance(statement, L.AssignAdd)  # Expecting AssignAdd
             rhs = statement.rhs
-            assert isinstance(rhs, L.Product)  # Expecting Sum
             lhs = statement.lhs
             assert isinstance(lhs, L.ArrayAccess)  # Expecting ArrayAccess
-            expressions[lhs].append(rhs)
+            if isinstance(rhs, L.Sum):
+                # Fused accumulation: treat each product term separately
+                expressions[lhs].extend(arg for arg in rhs.args if isinstance(arg, L.Product))
+            else:
+                assert isinstance(rhs, L.Product)  # Expecting Product
+                expressions[lhs].append(rhs)
 
     pre_loop: list[L.LNode] = []
     for lhs, rhs in expressions.items():
@@ -89,6 +89,11 @@ class FFCXBackendSymbols:
         # Index for loops over coefficient dofs, assumed to never be used in two nested loops.
         self.coefficient_dof_sum_index = L.Symbol("ic", dtype=L.DataType.INT)
 
+        # Loop indices for argument dofs, one symbol per argument rank
+        self.argument_loop_indices = tuple(
+            L.Symbol(name, dtype=L.DataType.INT) for name in ("i", "j", "k", "l")
+        )
+
         # Table for chunk of custom quadrature weights (including cell measure scaling).
         self.custom_weights_table = L.Symbol("weights_chunk", dtype=L.DataType.REAL)
 
@@ -113,8 +118,7 @@ class FFCXBackendSymbols:
 
     def argument_loop_index(self, iarg):
         """Loop index for argument iarg."""
-        indices = ["i", "j", "k", "l"]
-        return L.Symbol(indices[iarg], dtype=L.DataType.INT)
+        return self.argument_loop_indices[iarg]
 
     def weights_table(self, quadrature_rule):
         """Table of quadrature weights."""
@@ -69,17 +69,14 @@ def numba_ufcx_kernel_signature(dtype: npt.DTypeLike, xdtype: npt.DTypeLike):
     Raises:
         ImportError: If ``numba`` cannot be imported.
     """
-    try:
-        import numba.types as types
-        from numba import from_dtype
-
-        return types.void(
-            types.CPointer(from_dtype(dtype)),
-            types.CPointer(from_dtype(dtype)),
-            types.CPointer(from_dtype(dtype)),
-            types.CPointer(from_dtype(xdtype)),
-            types.CPointer(types.intc),
-            types.CPointer(types.uint8),
-        )
-    except ImportError as e:
-        raise e
+    import numba.types as types
+    from numba import from_dtype
+
+    return types.void(
+        types.CPointer(from_dtype(dtype)),
+        types.CPointer(from_dtype(dtype)),
+        types.CPointer(from_dtype(dtype)),
+        types.CPointer(from_dtype(xdtype)),
+        types.CPointer(types.intc),
+        types.CPointer(types.uint8),
+    )
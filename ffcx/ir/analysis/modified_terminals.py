@@ -88,23 +88,30 @@ class ModifiedTerminal:
         # Restriction to one cell or the other for interior facet integrals
         self.restriction = restriction
 
+        # Lazily computed identity tuple and hash; modified terminals
+        # are hashed and compared a lot during table building
+        self._as_tuple: typing.Optional[tuple] = None
+        self._hash: typing.Optional[int] = None
+
     def as_tuple(self):
         """Return a tuple with hashable values that uniquely identifies this modified terminal.
 
         Some of the derived variables can be omitted here as long as
         they are fully determined from the variables that are included here.
         """
-        t = self.terminal  # FIXME: Terminal is not sortable...
-        rv = self.reference_value
-        # bs = self.base_shape
-        # bsy = self.base_symmetry
-        # c = self.component
-        fc = self.flat_component
-        gd = self.global_derivatives
-        ld = self.local_derivatives
-        a = self.averaged
-        r = self.restriction
-        return (t, rv, fc, gd, ld, a, r)
+        if self._as_tuple is None:
+            t = self.terminal  # FIXME: Terminal is not sortable...
+            rv = self.reference_value
+            # bs = self.base_shape
+            # bsy = self.base_symmetry
+            # c = self.component
+            fc = self.flat_component
+            gd = self.global_derivatives
+            ld = self.local_derivatives
+            a = self.averaged
+            r = self.restriction
+            self._as_tuple = (t, rv, fc, gd, ld, a, r)
+        return self._as_tuple
 
     def argument_ordering_key(self):
         """Return a key for deterministic sorting of argument vertex indices.
@@ -130,7 +137,9 @@ class ModifiedTerminal:
 
     def __hash__(self):
         """Hash."""
-        return hash(self.as_tuple())
+        if self._hash is None:
+            self._hash = hash(self.as_tuple())
+        return self._hash
 
     def __eq__(self, other):
         """Check equality."""
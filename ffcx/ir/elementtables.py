@@ -26,8 +26,8 @@ logger = logging.getLogger("ffcx")
 default_rtol = 1e-6
 default_atol = 1e-9
 
-piecewise_ttypes = ("piecewise", "fixed", "ones", "zeros")
-uniform_ttypes = ("fixed", "ones", "zeros", "uniform")
+piecewise_ttypes = frozenset(("piecewise", "fixed", "ones", "zeros"))
+uniform_ttypes = frozenset(("fixed", "ones", "zeros", "uniform"))
 
 
 class ModifiedTerminalElement(typing.NamedTuple):
@@ -131,14 +131,16 @@ def get_ffcx_table_values(
     num_entities = cell.num_sub_entities(entity_dim)
 
     # Extract arrays for the right scalar component
-    component_tables = []
     component_element, offset, stride = element.get_component_element(flat_component)
 
-    for entity in range(num_entities):
-        entity_points = map_integral_points(points, integral_type, cell, entity)
-        tbl = component_element.tabulate(deriv_order, entity_points)
-        tbl = tbl[basix_index(derivative_counts)]
-        component_tables.append(tbl)
+    # Tabulate all entities in a single call by stacking their points,
+    # then split the result per entity again
+    entity_points = np.concatenate(
+        [map_integral_points(points, integral_type, cell, entity) for entity in range(num_entities)]
+    )
+    tbl = component_element.tabulate(deriv_order, entity_points)
+    tbl = tbl[basix_index(derivative_counts)]
+    component_tables = np.split(tbl, num_entities)
 
     if avg in ("cell", "facet"):
         # Compute numeric integral of the each component table
@@ -242,40 +244,32 @@ def get_modified_terminal_element(mt) -> typing.Optional[ModifiedTerminalElement
 def permute_quadrature_interval(points, reflections=0):
     """Permute quadrature points for an interval."""
     output = points.copy()
-    for p in output:
-        assert len(p) < 2 or np.isclose(p[1], 0)
-        assert len(p) < 3 or np.isclose(p[2], 0)
+    assert output.shape[1] < 2 or np.allclose(output[:, 1], 0)
+    assert output.shape[1] < 3 or np.allclose(output[:, 2], 0)
     for _ in range(reflections):
-        for n, p in enumerate(output):
-            output[n] = [1 - p[0]]
+        output[:, :1] = 1 - output[:, :1]
     return output
 
 
 def permute_quadrature_triangle(points, reflections=0, rotations=0):
     """Permute quadrature points for a triangle."""
     output = points.copy()
-    for p in output:
-        assert len(p) < 3 or np.isclose(p[2], 0)
+    assert output.shape[1] < 3 or np.allclose(output[:, 2], 0)
     for _ in range(rotations):
-        for n, p in enumerate(output):
-            output[n] = [p[1], 1 - p[0] - p[1]]
+        output = np.column_stack([output[:, 1], 1 - output[:, 0] - output[:, 1]])
     for _ in range(reflections):
-        for n, p in enumerate(output):
-            output[n] = [p[1], p[0]]
+        output = np.column_stack([output[:, 1], output[:, 0]])
     return output
 
 
 def permute_quadrature_quadrilateral(points, reflections=0, rotations=0):
     """Permute quadrature points for a quadrilateral."""
     output = points.copy()
-    for p in output:
-        assert len(p) < 3 or np.isclose(p[2], 0)
+    assert output.shape[1] < 3 or np.allclose(output[:, 2], 0)
     for _ in range(rotations):
-        for n, p in enumerate(output):
-            output[n] = [p[1], 1 - p[0]]
+        output = np.column_stack([output[:, 1], 1 - output[:, 0]])
     for _ in range(reflections):
-        for n, p in enumerate(output):
-            output[n] = [p[1], p[0]]
+        output = np.column_stack([output[:, 1], output[:, 0]])
     return output
 
 
@@ -318,7 +312,9 @@ def build_optimized_tables(
 
     _existing_tables = existing_tables.copy()
 
-    all_tensor_factors = []
+    # Deduplicated 1D factor tables, bucketed by shape so each new
+    # factor is only compared against candidates that can match
+    all_tensor_factors: dict[tuple, list] = {}
     tensor_n = 0
 
     for mt in modified_terminals:
@@ -470,9 +466,10 @@ def build_optimized_tables(
                 d = local_derivatives[i]
                 sub_tbl = j.tabulate(d, pts)[d]
                 sub_tbl = sub_tbl.reshape(1, 1, sub_tbl.shape[0], sub_tbl.shape[1])
-                for i in all_tensor_factors:
-                    if i.values.shape == sub_tbl.shape and np.allclose(i.values, sub_tbl):
-                        tensor_factors.append(i)
+                candidates = all_tensor_factors.setdefault(sub_tbl.shape, [])
+                for existing in candidates:
+                    if np.allclose(existing.values, sub_tbl):
+                        tensor_factors.append(existing)
                         break
                 else:
                     ut = UniqueTableReferenceT(
@@ -488,7 +485,7 @@ def build_optimized_tables(
                         None,
                         None,
                     )
-                    all_tensor_factors.append(ut)
+                    candidates.append(ut)
                     tensor_factors.append(ut)
                     mt_tables[ut.name] = ut
                     tensor_n += 1
@@ -522,47 +519,34 @@ def build_optimized_tables(
 
 def is_zeros_table(table, rtol=default_rtol, atol=default_atol):
     """Check if table values are all zero."""
-    return np.prod(table.shape) == 0 or np.allclose(
-        table, np.zeros(table.shape), rtol=rtol, atol=atol
-    )
+    return table.size == 0 or np.allclose(table, 0.0, rtol=rtol, atol=atol)
 
 
 def is_ones_table(table, rtol=default_rtol, atol=default_atol):
     """Check if table values are all one."""
-    return np.allclose(table, np.ones(table.shape), rtol=rtol, atol=atol)
+    return np.allclose(table, 1.0, rtol=rtol, atol=atol)
 
 
 def is_quadrature_table(table, rtol=default_rtol, atol=default_atol):
     """Check if table is a quadrature table."""
-    _, num_entities, num_points, num_dofs = table.shape
+    _, _, num_points, num_dofs = table.shape
     Id = np.eye(num_points)
-    return num_points == num_dofs and all(
-        np.allclose(table[0, i, :, :], Id, rtol=rtol, atol=atol) for i in range(num_entities)
-    )
+    return num_points == num_dofs and np.allclose(table[0], Id, rtol=rtol, atol=atol)
 
 
 def is_permuted_table(table, rtol=default_rtol, atol=default_atol):
     """Check if table is permuted."""
-    return not all(
-        np.allclose(table[0, :, :, :], table[i, :, :, :], rtol=rtol, atol=atol)
-        for i in range(1, table.shape[0])
-    )
+    return not np.allclose(table[:1], table[1:], rtol=rtol, atol=atol)
 
 
 def is_piecewise_table(table, rtol=default_rtol, atol=default_atol):
     """Check if table is piecewise."""
-    return all(
-        np.allclose(table[0, :, 0, :], table[0, :, i, :], rtol=rtol, atol=atol)
-        for i in range(1, table.shape[2])
-    )
+    return np.allclose(table[0, :, :1, :], table[0, :, 1:, :], rtol=rtol, atol=atol)
 
 
 def is_uniform_table(table, rtol=default_rtol, atol=default_atol):
     """Check if table is uniform."""
-    return all(
-        np.allclose(table[0, 0, :, :], table[0, i, :, :], rtol=rtol, atol=atol)
-        for i in range(1, table.shape[1])
-    )
+    return np.allclose(table[0, :1], table[0, 1:], rtol=rtol, atol=atol)
 
 
 def analyse_table_type(table, rtol=default_rtol, atol=default_atol):
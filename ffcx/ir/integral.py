@@ -95,8 +95,11 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
         )
 
         # Fetch unique tables for this quadrature rule
-        table_types = {v.name: v.ttype for v in mt_table_reference.values()}
-        tables = {v.name: v.values for v in mt_table_reference.values()}
+        table_types = {}
+        tables = {}
+        for v in mt_table_reference.values():
+            table_types[v.name] = v.ttype
+            tables[v.name] = v.values
 
         S_targets = [i for i, v in S.nodes.items() if v.get("target", False)]
         num_components = np.int32(np.prod(expression.ufl_shape))
@@ -158,7 +161,7 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
         # Get list of indices in F which are the arguments (should be at start)
         argkeys = set()
         for w in argument_factorization:
-            argkeys = argkeys | set(w)
+            argkeys.update(w)
         argkeys = list(argkeys)
 
         # Build set of modified_terminals for each mt factorized vertex in F
@@ -181,6 +184,7 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
 
         # Loop over factorization terms
         block_contributions = collections.defaultdict(list)
+        dofmap_cache: dict[tuple[str, int, int], tuple[int, ...]] = {}
         for ma_indices, fi_ci in sorted(argument_factorization.items()):
             # Get a bunch of information about this term
             assert rank == len(ma_indices)
@@ -192,9 +196,15 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
 
             blockmap = []
             for tr in trs:
-                begin = tr.offset
-                num_dofs = tr.values.shape[3]
-                dofmap = tuple(begin + i * tr.block_size for i in range(num_dofs))
+                # The same table is typically referenced by many terms,
+                # so reuse its dofmap tuple
+                key = (tr.name, tr.offset, tr.block_size)
+                dofmap = dofmap_cache.get(key)
+                if dofmap is None:
+                    begin = tr.offset
+                    num_dofs = tr.values.shape[3]
+                    dofmap = tuple(begin + i * tr.block_size for i in range(num_dofs))
+                    dofmap_cache[key] = dofmap
                 blockmap.append(dofmap)
 
             blockmap = tuple(blockmap)
@@ -214,13 +224,8 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
 
             # Check if each *each* factor corresponding to this argument is piecewise
             all_factors_piecewise = all(F.nodes[ifi[0]]["status"] == "piecewise" for ifi in fi_ci)
-            block_is_permuted = False
-            for name in unames:
-                if tables[name].shape[0] > 1:
-                    block_is_permuted = True
-            ma_data = []
-            for i, ma in enumerate(ma_indices):
-                ma_data.append(ModifiedArgumentDataT(ma, trs[i]))
+            block_is_permuted = any(tables[name].shape[0] > 1 for name in unames)
+            ma_data = [ModifiedArgumentDataT(ma, trs[i]) for i, ma in enumerate(ma_indices)]
 
             block_is_transposed = False  # FIXME: Handle transposes for these block types
             block_unames = unames
@@ -308,7 +313,7 @@ def analyse_dependencies(F, mt_unique_table_reference):
                 targets.append(j)
 
     # Build piecewise/varying markers for factorized_vertices
-    varying_ttypes = ("varying", "quadrature", "uniform")
+    varying_ttypes = frozenset(("varying", "quadrature", "uniform"))
     varying_indices = []
     for i, v in F.nodes.items():
         if v.get("mt") is None:
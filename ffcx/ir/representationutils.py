@@ -27,12 +27,14 @@ class QuadratureRule:
         self.tensor_factors = tensor_factors
         self.has_tensor_factors = tensor_factors is not None
         self._hash = None
+        self._id = None
 
     def __hash__(self):
         """Hash."""
         if self._hash is None:
-            self.hash_obj = hashlib.sha1(self.points)
-            self._hash = int(self.hash_obj.hexdigest(), 32)
+            digest = hashlib.sha1(self.points).hexdigest()
+            self._hash = int(digest, 32)
+            self._id = digest[-3:]
         return self._hash
 
     def __eq__(self, other):
@@ -46,7 +48,9 @@ class QuadratureRule:
             This identifier is used to provide unique names to tables and symbols
             in generated code.
         """
-        return self.hash_obj.hexdigest()[-3:]
+        if self._id is None:
+            hash(self)
+        return self._id
 
 
 def create_quadrature_points_and_weights(